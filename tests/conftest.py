@@ -8,88 +8,14 @@ import json
 import re
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from mcp.server.fastmcp import Context
+from server.connection_manager import UnityConnectionManager
 from server.dynamic_tools import DynamicToolManager
+from server.dynamic_tool_invoker import DynamicToolInvoker
+from server.unity_tcp_client import UnityTcpClient
+from tests.helpers import TEST_SCHEMA, StubCtx, passthrough
 
-# Mock FunctionResource for testing
-class MockFunctionResource:
-    """Mock FunctionResource for testing"""
-    def __init__(self, uri=None, name=None, description=None, mime_type=None, fn=None):
-        self.uri = uri
-        self.name = name
-        self.description = description
-        self.mime_type = mime_type
-        self.fn = fn
-        
-        # Extract URI parameters, handling URL-encoded braces
-        uri_str = str(uri or '')
-        if '%7B' in uri_str and '%7D' in uri_str:
-            self.uri_params = re.findall(r"%7B([^%]+)%7D", uri_str)
-        else:
-            self.uri_params = re.findall(r"\{([^}]+)\}", uri_str)
-            
-        # If this is a known resource, use predefined parameters
-        expected_params = {
-            "info": [],
-            "logs": ["max_logs"],
-            "scene": ["scene_name"],
-            "object": ["id", "property_name"],
-            "complex": ["type", "id", "attribute", "format"]
-        }
-        
-        if name in expected_params:
-            self.uri_params = expected_params[name]
-
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("unity_mcp_tests")
 
-# Test schema with sample tools and resources
-TEST_SCHEMA = {
-    "tools": [
-        {
-            "name": "execute_code",
-            "description": "Executes C# code in Unity",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "code": {
-                        "type": "string",
-                        "description": "C# code to execute"
-                    }
-                },
-                "required": ["code"]
-            }
-        }
-    ],
-    "resources": [
-        {
-            "name": "unity_info",
-            "description": "Get Unity information",
-            "uri": "unity://info",
-            "mimeType": "application/json"
-        },
-        {
-            "name": "logs",
-            "description": "Get Unity logs",
-            "uri": "unity://logs/{max_logs}",
-            "mimeType": "application/json"
-        },
-        {
-            "name": "object_properties",
-            "description": "Get GameObject properties",
-            "uri": "unity://gameobject/{id}/properties/{property_name}",
-            "mimeType": "application/json"
-        },
-        {
-            "name": "scene",
-            "description": "Get scene information with optional parameters",
-            "uri": "unity://scene/{scene_name}/{detail_level}",
-            "mimeType": "application/json"
-        }
-    ]
-}
-
 # Fixtures for mocking
 @pytest.fixture
 def mock_client():
@@ -113,6 +39,35 @@ def mock_client():
     client.has_command = AsyncMock(return_value=True)
     return client
 
+@pytest.fixture(scope="session")
+def session_unity_client():
+    """Create a spec'd Unity TCP client mock shared by the test session"""
+    client = MagicMock(spec=UnityTcpClient)
+    client.connected = True
+    # Only the coroutines the tests await need to be async mocks
+    client.get_schema = AsyncMock()
+    client.send_command = AsyncMock()
+    return client
+
+@pytest.fixture
+def mock_unity_client(session_unity_client):
+    """Provide the session-shared Unity client mock, reset after each test"""
+    yield session_unity_client
+    session_unity_client.reset_mock(return_value=True, side_effect=True)
+    session_unity_client.connected = True
+
+@pytest.fixture(scope="session")
+def connection_manager(session_unity_client):
+    """Create a connection manager that runs operations directly on the mocked client"""
+    manager = UnityConnectionManager(session_unity_client)
+    manager.execute_with_reconnect = AsyncMock(side_effect=passthrough)
+    return manager
+
+@pytest.fixture(scope="session")
+def invoker(connection_manager):
+    """Create a DynamicToolInvoker over the shared connection manager"""
+    return DynamicToolInvoker(connection_manager)
+
 @pytest.fixture
 def mock_fastmcp():
     """Create a mock FastMCP instance"""
@@ -154,13 +109,9 @@ def mock_fastmcp():
     return mcp
 
 @pytest.fixture
-def mock_context():
-    """Create a mock Context object"""
-    ctx = MagicMock(spec=Context)
-    ctx.info = AsyncMock()
-    ctx.error = AsyncMock()
-    ctx.debug = AsyncMock()
-    return ctx
+def stub_ctx():
+    """Create a recording StubCtx"""
+    return StubCtx()
 
 @pytest.fixture
 def dynamic_manager(mock_fastmcp, mock_client, patch_unity_client):
@@ -210,7 +161,7 @@ def dynamic_manager(mock_fastmcp, mock_client, patch_unity_client):
                 else:
                     uri_params = []
                 
-                print(f"DEBUG: [conftest] Adding resource {resource.name} with uri_params: {uri_params}")
+                logger.debug(f"Adding resource {resource.name} with uri_params: {uri_params}")
                 
                 mock_fastmcp.registered_resources[resource.name] = {
                     "uri": resource.uri if hasattr(resource, 'uri') else None,
@@ -347,8 +298,10 @@ def patch_unity_client(mock_client):
 
 
 # Configure async test support
-def pytest_configure(config):
-    """Configure pytest for async tests"""
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Event loop policy for the session-wide event loop shared by all async tests"""
     # Set Windows event loop policy if needed
     if sys.platform == 'win32':
-        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
\ No newline at end of file
+        return asyncio.WindowsSelectorEventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""Shared test doubles and data for Unity MCP tests"""
+
+from unittest.mock import AsyncMock
+
+# Test schema with sample tools and resources
+TEST_SCHEMA = {
+    "tools": [
+        {
+            "name": "execute_code",
+            "description": "Executes C# code in Unity",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "code": {
+                        "type": "string",
+                        "description": "C# code to execute"
+                    }
+                },
+                "required": ["code"]
+            }
+        }
+    ],
+    "resources": [
+        {
+            "name": "unity_info",
+            "description": "Get Unity information",
+            "uri": "unity://info",
+            "mimeType": "application/json"
+        },
+        {
+            "name": "logs",
+            "description": "Get Unity logs",
+            "uri": "unity://logs/{max_logs}",
+            "mimeType": "application/json"
+        },
+        {
+            "name": "object_properties",
+            "description": "Get GameObject properties",
+            "uri": "unity://gameobject/{id}/properties/{property_name}",
+            "mimeType": "application/json"
+        },
+        {
+            "name": "scene",
+            "description": "Get scene information with optional parameters",
+            "uri": "unity://scene/{scene_name}/{detail_level}",
+            "mimeType": "application/json"
+        }
+    ]
+}
+
+class StubCtx:
+    """Minimal stand-in for an MCP Context that records debug, info and error messages"""
+    __slots__ = ("debug_calls", "info_calls", "error_calls")
+    
+    def __init__(self):
+        self.debug_calls = []
+        self.info_calls = []
+        self.error_calls = []
+        
+    async def debug(self, message):
+        self.debug_calls.append(message)
+        
+    async def info(self, message):
+        self.info_calls.append(message)
+        
+    async def error(self, message):
+        self.error_calls.append(message)
+
+# Make execute_with_reconnect actually await the coroutine and return the result
+async def passthrough(func):
+    """Run a connection manager operation directly, without reconnect handling"""
+    return await func()
+
+def async_return(value):
+    """Build a bare coroutine function returning value, for stubs whose calls are never asserted"""
+    async def _return(*args, **kwargs):
+        return value
+    return _return
+
+async def _echo_command(command, params):
+    """Default RecordingUnityClient response echoing the command back as a success"""
+    return {"command": command, "params": params, "result": "success"}
+
+class RecordingUnityClient:
+    """Unity client stand-in that serves a fixed schema and records every command sent through it
+
+    Commands are answered by the responder coroutine, which defaults to echoing them back.
+    """
+
+    def __init__(self, schema=TEST_SCHEMA, responder=_echo_command):
+        self.connected = True
+        self.calls = []
+        self.get_schema = AsyncMock(return_value=schema)
+        self._responder = responder
+
+    def on(self, event, callback):
+        """Accept event handlers without ever firing them"""
+
+    async def send_command(self, command, params):
+        self.calls.append((command, params))
+        return await self._responder(command, params)
+
+    async def has_command(self, command_name):
+        return True
+
+    async def connect(self):
+        return True
+
+    async def disconnect(self):
+        return None
+
+    def reset_mock(self):
+        self.calls.clear()
+        self.get_schema.reset_mock()
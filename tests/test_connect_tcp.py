@@ -43,11 +43,6 @@ class TestUnityTcpClient(UnityTcpClient):
         self.tcp_client.on("disconnected", self._on_tcp_disconnected)
         self.tcp_client.on("error", self._on_tcp_error)
 
-# Configure more detailed logging for debugging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger("tcp_test")
 
 # Set TCP client logging to DEBUG
@@ -267,6 +262,12 @@ async def get_schema_only():
         logger.error(f"Test failed: {str(ex)}")
 
 if __name__ == "__main__":
+    # Configure more detailed logging for debugging
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     # Choose which test to run
     if len(sys.argv) > 1 and sys.argv[1] == "--schema":
         asyncio.run(get_schema_only())
@@ -5,45 +5,11 @@ import asyncio
 import logging
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
 
 from mcp.server.fastmcp import FastMCP
 from server.dynamic_tools import DynamicToolManager
 
-# Helper function for invoking dynamic resources
-async def invoke_dynamic_resource(client, resource_name: str, parameters: Optional[Dict[str, Any]] = None):
-    """
-    Invoke a dynamic resource.
-    
-    Args:
-        resource_name: Name of the resource to invoke
-        parameters: Resource parameters
-        
-    Returns:
-        Resource result
-    """
-    if parameters is None:
-        parameters = {}
-        
-    return await client.send_command("access_resource", {
-        "resource_name": resource_name,
-        "parameters": parameters
-    })
-
-# Import or define the necessary functions
-# This should match the implementation in test_dynamic_tools.py
-async def invoke_dynamic_resource(client, resource_name: str, parameters: Dict[str, Any] = None):
-    """Helper function to invoke a dynamic resource"""
-    if parameters is None:
-        parameters = {}
-        
-    return await client.send_command("access_resource", {
-        "resource_name": resource_name,
-        "parameters": parameters
-    })
-
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("test_dynamic_resources")
 
 # Mark all tests with asyncio
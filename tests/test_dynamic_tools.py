@@ -1,26 +1,43 @@
 """Tests for dynamic tool and resource registration"""
 
 import pytest
+import pytest_asyncio
 import asyncio
+import functools
 import logging
 import json
+import re
 from typing import Dict, Any, Sequence
 import sys
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import patch, MagicMock
 
 from server.connection_manager import UnityConnectionManager
 from server.dynamic_tools import DynamicToolManager
 from server.dynamic_tool_invoker import DynamicToolInvoker
 from mcp.server.fastmcp import FastMCP
+from mcp.types import TextContent, ImageContent, EmbeddedResource
+from tests.helpers import RecordingUnityClient
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("test_dynamic_tools")
 
 # Mark all async tests with the asyncio marker
 pytestmark = pytest.mark.asyncio
 
-@pytest.fixture
+# Test values by parameter name keyword, checked in order
+_TEST_VALUE_RULES = (
+    # Numeric values
+    (re.compile(r"max|count|limit|size", re.IGNORECASE), 5),
+    # Object identifiers
+    (re.compile(r"id|guid|key|reference", re.IGNORECASE), "test_object_01"),
+    # Object names
+    (re.compile(r"name|scene|title", re.IGNORECASE), "TestScene"),
+    # Property names
+    (re.compile(r"property|attribute|field", re.IGNORECASE), "position"),
+    # Quality settings
+    (re.compile(r"quality|level|detail", re.IGNORECASE), "high"),
+)
+
+@pytest.fixture(scope="session")
 def mcp_test_instance():
     """Create a FastMCP instance for testing"""
     return FastMCP("Test Dynamic Tools", description="Test dynamic tool registration")
@@ -405,6 +422,7 @@ class TestDynamicTools:
         client = connected_client
         
         connection_manager = UnityConnectionManager(client)
+        invoker = DynamicToolInvoker(connection_manager)
 
         # Create dynamic tool manager with the client directly
         manager = DynamicToolManager(mcp_test_instance, connection_manager)
@@ -437,7 +455,7 @@ class TestDynamicTools:
             
         logger.info(f"Using parameter name: {param_name}")
         code = "Debug.Log(\\\"Hello from dynamic tool\\\"); return 42;"
-        result = await DynamicToolInvoker(connection_manager).invoke_tool(execute_code_tool, {param_name: code})
+        result = await invoker.invoke_tool(execute_code_tool, {param_name: code})
         
         assert result is not None, "Tool invocation returned None"
         logger.info(f"Tool result: {json.dumps(result, indent=2)}")
@@ -482,6 +500,7 @@ class TestDynamicTools:
         client = connected_client
         
         connection_manager = UnityConnectionManager(client)
+        invoker = DynamicToolInvoker(connection_manager)
         
         # Create dynamic tool manager with the client directly
         manager = DynamicToolManager(mcp_test_instance, connection_manager)
@@ -507,7 +526,7 @@ class TestDynamicTools:
         info_resource = info_resource_names[0]
         logger.info(f"TESTING RESOURCE: {info_resource} (no parameters)")
         
-        result = await DynamicToolInvoker(connection_manager).invoke_resource(info_resource)
+        result = await invoker.invoke_resource(info_resource)
         
         assert result is not None, "Resource invocation returned None"
         logger.info(f"Resource result: {json.dumps(result, indent=2)}")
@@ -543,7 +562,7 @@ class TestDynamicTools:
             
         logger.info(f"TESTING RESOURCE: {found_resource} with parameters: {param_dict}")
         
-        result = await DynamicToolInvoker(connection_manager).invoke_dynamic_resource(found_resource, param_dict)
+        result = await invoker.invoke_resource(found_resource, param_dict)
         
         assert result is not None, "Resource invocation returned None"
         logger.info(f"Resource result with params: {json.dumps(result, indent=2)}")
@@ -557,6 +576,7 @@ class TestDynamicTools:
         logger.info("Using connected client...")
         client = connected_client
         connection_manager = UnityConnectionManager(client)
+        invoker = DynamicToolInvoker(connection_manager)
         # Create dynamic tool manager with the client directly
         manager = DynamicToolManager(mcp_test_instance, connection_manager)
         
@@ -566,31 +586,16 @@ class TestDynamicTools:
         
         # Find multi-parameter resources
         multi_param_resources = {}
-        for name, url_pattern in manager.registered_resources.items():
-            if url_pattern.count('{') > 1:
-                # Extract parameter names from URL pattern
-                param_names = []
-                parts = url_pattern.split('/')
-                for part in parts:
-                    if part.startswith('{') and part.endswith('}'):
-                        # Remove the curly braces to get the parameter name
-                        param_name = part[1:-1]
-                        param_names.append(param_name)
-                
-                # Only include resources with multiple parameters
-                if len(param_names) > 1:
-                    logger.info(f"Found multi-parameter resource {name} with parameters: {param_names}")
-                    multi_param_resources[name] = param_names
-            elif url_pattern.count('{') == 1:
+        for name, info in manager.registered_resources.items():
+            # Parameter names the manager extracted from the resource URI
+            param_names = info["uri_params"]
+            if len(param_names) > 1:
+                logger.info(f"Found multi-parameter resource {name} ({info['uri']}) with parameters: {param_names}")
+                multi_param_resources[name] = param_names
+            elif param_names == ["objectId"]:
                 # Also check for single parameter resources with specific parameter names we need to handle
-                parts = url_pattern.split('/')
-                for part in parts:
-                    if part.startswith('{') and part.endswith('}'):
-                        param_name = part[1:-1]
-                        if param_name == "objectId":
-                            logger.info(f"Found resource {name} with objectId parameter")
-                            multi_param_resources[name] = [param_name]
-                            break
+                logger.info(f"Found resource {name} with objectId parameter")
+                multi_param_resources[name] = param_names
         
         if not multi_param_resources:
             logger.info("No multi-parameter resources found, creating a simulated test")
@@ -603,7 +608,7 @@ class TestDynamicTools:
             # Call with our test parameters (this will likely fail as expected)
             logger.info(f"Invoking simulated multi-param resource with parameters: {json.dumps(test_params)}")
             with pytest.raises(Exception):
-                await DynamicToolInvoker(connection_manager).invoke_resource("test_multi_param", test_params)
+                await invoker.invoke_resource("test_multi_param", test_params)
         else:
             # Test found multi-parameter resources
             for name, param_names in multi_param_resources.items():
@@ -611,17 +616,19 @@ class TestDynamicTools:
                 
                 # Create test parameters
                 params = {}
+                snake_case_names = {}
                 for param_name in param_names:
                     # Use snake_case for parameters in our test code
                     snake_case_name = param_name.replace("Id", "_id").replace("Name", "_name")
                     snake_case_name = ''.join(['_' + c.lower() if c.isupper() else c.lower() for c in snake_case_name]).lstrip('_')
+                    snake_case_names[param_name] = snake_case_name
                     params[snake_case_name] = self._generate_test_value(param_name)
                 
                 # Log for debugging
                 logger.info(f"Invoking multi-param resource {name} with snake_case parameters: {json.dumps(params)}")
                 
                 # Parameters will be automatically converted to camelCase by invoke_resource
-                result = await DynamicToolInvoker(connection_manager).invoke_resource(name, params)
+                result = await invoker.invoke_resource(name, params)
                 
                 assert result is not None, "Resource invocation returned None"
                 logger.info(f"Multi-param resource result: {json.dumps(result, indent=2)}")
@@ -631,49 +638,25 @@ class TestDynamicTools:
                 
                 # Test with missing parameter if we have at least 2
                 if len(param_names) > 1:
-                    # Look for the parameter that's most likely to be required
-                    # Common required parameter names
-                    required_param_indicators = ["id", "object", "scene", "name", "path"]
-                    
-                    # Find a parameter that's likely required
-                    likely_required = None
-                    for key in params.keys():
-                        if any(indicator in key.lower() for indicator in required_param_indicators):
-                            likely_required = key
-                            break
-                    
-                    # If we couldn't find a likely required parameter, use the first one
-                    if not likely_required:
-                        likely_required = list(params.keys())[0]
-                    
-                    # Make a copy of params without the likely required parameter
-                    missing_params = params.copy()
-                    del missing_params[likely_required]
+                    # Drop the first URI parameter of the registered resource
+                    likely_required = snake_case_names[param_names[0]]
+
+                    # Make a copy of params without the required parameter
+                    missing_params = {k: v for k, v in params.items() if k != likely_required}
                     
                     logger.info(f"TESTING: Multi-param resource with missing parameter {likely_required}")
                     logger.info(f"Invoking with incomplete parameters: {json.dumps(missing_params)}")
                     
-                    # This should raise an exception since the parameter is required
+                    # The invoker only raises when Unity reports the parameter as missing,
+                    # otherwise it passes Unity's response through
                     try:
-                        with pytest.raises(Exception):
-                            await DynamicToolInvoker(connection_manager).invoke_resource(name, missing_params)
+                        result = await invoker.invoke_resource(name, missing_params)
+                    except ValueError as e:
+                        assert "Missing required parameter" in str(e)
                         logger.info("Successfully caught exception for missing required parameter")
-                    except pytest.fail.Exception:
-                        # If it doesn't raise an exception, log that this parameter might not be required
-                        logger.warning(f"Parameter {likely_required} might not be required - test did not raise exception")
-                        
-                        # Try another parameter if available
-                        if len(params) > 2:
-                            other_param = next(k for k in params.keys() if k != likely_required)
-                            missing_params = params.copy()
-                            del missing_params[other_param]
-                            
-                            logger.info(f"TESTING: Multi-param resource with different missing parameter {other_param}")
-                            logger.info(f"Invoking with incomplete parameters: {json.dumps(missing_params)}")
-                            
-                            # Try with a different parameter
-                            with pytest.raises(Exception):
-                                await DynamicToolInvoker(connection_manager).invoke_resource(name, missing_params)
+                    else:
+                        assert isinstance(result, dict), "Result is not a dictionary"
+                        logger.warning(f"Parameter {likely_required} might not be required - Unity did not report it missing")
     
     async def test_error_handling(self, connected_client, mcp_test_instance):
         """Test error handling for non-existent tools and resources"""
@@ -681,6 +664,7 @@ class TestDynamicTools:
         logger.info("Using connected client...")
         client = connected_client
         connection_manager = UnityConnectionManager(client)
+        invoker = DynamicToolInvoker(connection_manager)
         
         # Create dynamic tool manager with the client directly
         manager = DynamicToolManager(mcp_test_instance, connection_manager)
@@ -691,7 +675,7 @@ class TestDynamicTools:
         
         # Try invoking an unknown tool
         logger.info("TESTING: non-existent tool")
-        result = await DynamicToolInvoker(connection_manager).invoke_tool("non_existent_tool", {})
+        result = await invoker.invoke_tool("non_existent_tool", {})
         
         # Should return error result but not crash
         assert result is not None, "Error handling returned None"
@@ -699,302 +683,222 @@ class TestDynamicTools:
         
         # Try invoking an unknown resource
         logger.info("TESTING: non-existent resource")
-        result = await DynamicToolInvoker(connection_manager).invoke_resource("non_existent_resource", {})
+        result = await invoker.invoke_resource("non_existent_resource", {})
         
         # Should return error result but not crash
         assert result is not None, "Error handling returned None"
         logger.info(f"Non-existent resource result: {json.dumps(result, indent=2)}")
     
 
-    def _generate_test_value(self, param_name: str) -> Any:
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _generate_test_value(param_name: str) -> Any:
         """Generate a test value based on parameter name"""
-        # Convert to lowercase for comparison
-        normalized_name = param_name.lower()
-        
-        # Handle numeric values
-        if any(keyword in normalized_name for keyword in ["max", "count", "limit", "size"]):
-            return 5
-            
-        # Handle object identifiers
-        elif any(keyword in normalized_name for keyword in ["id", "guid", "key", "reference"]):
-            return "test_object_01"
-            
-        # Handle object names
-        elif any(keyword in normalized_name for keyword in ["name", "scene", "title"]):
-            return "TestScene"
-            
-        # Handle property names
-        elif any(keyword in normalized_name for keyword in ["property", "attribute", "field"]):
-            return "position"
-            
-        # Handle quality settings
-        elif any(keyword in normalized_name for keyword in ["quality", "level", "detail"]):
-            return "high"
-            
-        # Handle any other parameters
-        else:
-            return f"test_value_for_{param_name}"
+        for pattern, value in _TEST_VALUE_RULES:
+            if pattern.search(param_name):
+                return value
+        return f"test_value_for_{param_name}"
 
-# Modified version of the tests for mocked environment
-class TestDynamicToolsMocked:
-    """Test suite for dynamic tools using mocked Unity client"""
-    
-    @pytest.fixture
-    def mock_unity_client(self):
-        """Create a mocked Unity client for testing without Unity"""
-        client = AsyncMock()
-        
-        # Mock schema response - exactly matching the actual response format
-        client.get_schema = AsyncMock(return_value={
-            "id": "req_3f104d03fe1f42dd9af957826f17b98f",
-            "type": "response",
-            "status": "success",
-            "result": {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": json.dumps({
-                            "tools": [
-                                {
-                                    "name": "scene_load_scene",
-                                    "description": "Load a scene by name",
-                                    "inputSchema": {
-                                        "type": "object",
-                                        "properties": {
-                                            "scene_name": {
-                                                "type": "string",
-                                                "description": "Name of the scene to load"
-                                            },
-                                            "mode": {
-                                                "type": "string",
-                                                "description": "Load mode (Single, Additive)"
-                                            }
-                                        },
-                                        "required": ["scene_name"]
-                                    },
-                                    "example": "scene_load_scene(\"MainScene\", \"Additive\")"
-                                },
-                                {
-                                    "name": "editor_execute_code",
-                                    "description": "Execute code in editor",
-                                    "inputSchema": {
-                                        "type": "object",
-                                        "properties": {
-                                            "param1": {
-                                                "type": "string",
-                                                "description": "Code to execute"
-                                            }
-                                        },
-                                        "required": []
-                                    },
-                                    "example": "editor_execute_code(\"Debug.Log('Hello')\")"
-                                },
-                                {
-                                    "name": "editor_take_screenshot",
-                                    "description": "Take a screenshot of the Unity Editor",
-                                    "inputSchema": {
-                                        "type": "object",
-                                        "properties": {
-                                            "output_path": {
-                                                "type": "string",
-                                                "description": "Path where to save the screenshot"
-                                            }
-                                        },
-                                        "required": []
-                                    }
-                                }
-                            ],
-                            "resources": [
-                                {
-                                    "name": "editor_info",
-                                    "description": "Get information about the Unity Editor",
-                                    "uri": "unity://editor/info",
-                                    "mimeType": "application/json",
-                                    "parameters": {}
-                                },
-                                {
-                                    "name": "scene_active_scene",
-                                    "description": "Get information about the active scene",
-                                    "uri": "unity://scene/active",
-                                    "mimeType": "application/json",
-                                    "parameters": {}
-                                },
-                                {
-                                    "name": "object_info",
-                                    "description": "Get information about a specific GameObject",
-                                    "uri": "unity://object/{object_id}",
-                                    "mimeType": "application/json",
-                                    "parameters": {}
-                                }
-                            ]
-                        })
-                    }
-                ]
-            }
-        })
-        
-        # Mock send_command response
-        client.send_command = AsyncMock(side_effect=self._mock_send_command)
-        client.connected = True
-        client.has_command = AsyncMock(return_value=True)
-        client.connect = AsyncMock(return_value=True)
-        client.disconnect = AsyncMock(return_value=None)
-        
-        return client
-    
-    
-    
-    def _mock_send_command(self, command: str, params: Dict[str, Any]):
-        """Mock the send_command method based on the command and parameters"""
-        if command == "execute_tool":
-            tool_name = params.get("tool_name", "")
-            
-            if tool_name == "scene_load_scene":
-                return {
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": "Scene loaded successfully"
-                            }
-                        ],
-                        "isError": False
-                    }
-                }
-            elif tool_name == "editor_execute_code":
-                return {
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": "Code executed successfully. Result: 42"
-                            }
-                        ],
-                        "isError": False
-                    }
-                }
-            elif tool_name == "editor_take_screenshot":
-                return {
-                    "result": {
-                        "content": [
-                            {
-                                "type": "image",
-                                "image": {
-                                    "url": "/tmp/screenshot.png",
-                                    "mimeType": "image/png"
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": "Screenshot captured"
-                            }
-                        ],
-                        "isError": False
-                    }
-                }
-            else:
-                return {
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"Unknown tool: {tool_name}"
-                            }
-                        ],
-                        "isError": True
-                    }
-                }
-        elif command == "access_resource":
-            resource_name = params.get("resource_name", "")
-            parameters = params.get("parameters", {})
-            
-            if resource_name == "unity_info":
-                return {
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": json.dumps({
-                                    "unityVersion": "2022.3.10f1",
-                                    "platform": "Windows",
-                                    "editorMode": True
-                                })
-                            }
-                        ],
-                        "isError": False
-                    }
-                }
-            elif resource_name == "logs":
-                max_logs = parameters.get("max_logs", 10)
-                logs = []
-                for i in range(min(max_logs, 3)):
-                    logs.append(f"Log message {i+1}")
-                
-                return {
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": json.dumps(logs)
-                            }
-                        ],
-                        "isError": False
+
+# Mocked Unity schema, serialized once for every get_schema response
+_SCHEMA_JSON_TEXT = json.dumps({
+    "tools": [
+        {
+            "name": "scene_load_scene",
+            "description": "Load a scene by name",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "scene_name": {
+                        "type": "string",
+                        "description": "Name of the scene to load"
+                    },
+                    "mode": {
+                        "type": "string",
+                        "description": "Load mode (Single, Additive)"
                     }
-                }
-            elif resource_name == "object_properties":
-                obj_id = parameters.get("id", "")
-                property_name = parameters.get("property_name", "")
-                
-                return {
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": json.dumps({
-                                    "id": obj_id,
-                                    "property": property_name,
-                                    "value": f"Mocked value for {obj_id}.{property_name}"
-                                })
-                            }
-                        ],
-                        "isError": False
+                },
+                "required": ["scene_name"]
+            },
+            "example": "scene_load_scene(\"MainScene\", \"Additive\")"
+        },
+        {
+            "name": "editor_execute_code",
+            "description": "Execute code in editor",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "param1": {
+                        "type": "string",
+                        "description": "Code to execute"
                     }
-                }
-            else:
-                return {
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"Unknown resource: {resource_name}"
-                            }
-                        ],
-                        "isError": True
+                },
+                "required": []
+            },
+            "example": "editor_execute_code(\"Debug.Log('Hello')\")"
+        },
+        {
+            "name": "editor_take_screenshot",
+            "description": "Take a screenshot of the Unity Editor",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "output_path": {
+                        "type": "string",
+                        "description": "Path where to save the screenshot"
                     }
-                }
-        else:
-            return {
-                "result": {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": f"Unknown command: {command}"
-                        }
-                    ],
-                    "isError": True
-                }
+                },
+                "required": []
             }
-    
-    @pytest.mark.asyncio
-    async def test_mock_dynamic_manager_registration(self, mock_unity_client, mcp_test_instance):
-        """Test registering tools and resources with mocked client"""
-        # Create dynamic tool manager with client directly
-        manager = DynamicToolManager(mcp_test_instance, mock_unity_client)
-        
-        # Register tools from schema
+        }
+    ],
+    "resources": [
+        {
+            "name": "editor_info",
+            "description": "Get information about the Unity Editor",
+            "uri": "unity://editor/info",
+            "mimeType": "application/json",
+            "parameters": {}
+        },
+        {
+            "name": "scene_active_scene",
+            "description": "Get information about the active scene",
+            "uri": "unity://scene/active",
+            "mimeType": "application/json",
+            "parameters": {}
+        },
+        {
+            "name": "object_info",
+            "description": "Get information about a specific GameObject",
+            "uri": "unity://object/{object_id}",
+            "mimeType": "application/json",
+            "parameters": {}
+        },
+        {
+            "name": "logs",
+            "description": "Get recent Unity console logs",
+            "uri": "unity://logs/{max_logs}",
+            "mimeType": "application/json",
+            "parameters": {}
+        }
+    ]
+})
+
+_UNITY_INFO_TEXT = json.dumps({
+    "unityVersion": "2022.3.10f1",
+    "platform": "Windows",
+    "editorMode": True
+})
+
+# Serialized logs indexed by the number of logs returned (the mock caps it at 3)
+_LOGS_TEXT = [json.dumps([f"Log message {i+1}" for i in range(count)]) for count in range(4)]
+
+
+def _text_response(text: str, is_error: bool = False) -> Dict[str, Any]:
+    """Build a mocked Unity response with a single text content item"""
+    return {"result": {"content": [{"type": "text", "text": text}], "isError": is_error}}
+
+
+def _logs_response(params: Dict[str, Any]) -> Dict[str, Any]:
+    max_logs = params.get("parameters", {}).get("maxLogs", 10)
+    return _text_response(_LOGS_TEXT[max(0, min(max_logs, 3))])
+
+
+def _object_properties_response(params: Dict[str, Any]) -> Dict[str, Any]:
+    parameters = params.get("parameters", {})
+    obj_id = parameters.get("objectId", "")
+    property_name = parameters.get("propertyName", "")
+    return _text_response(json.dumps({
+        "id": obj_id,
+        "property": property_name,
+        "value": f"Mocked value for {obj_id}.{property_name}"
+    }))
+
+
+# Mocked tool responses keyed by command; the invoker sends the tool name as the command
+_TOOL_RESPONSES: Dict[str, Any] = {
+    "scene_load_scene": _text_response("Scene loaded successfully"),
+    "editor_execute_code": _text_response("Code executed successfully. Result: 42"),
+    "editor_take_screenshot": {
+        "result": {
+            "content": [
+                {"type": "image", "image": {"url": "/tmp/screenshot.png", "mimeType": "image/png"}},
+                {"type": "text", "text": "Screenshot captured"}
+            ],
+            "isError": False
+        }
+    },
+}
+
+# Mocked access_resource responses keyed by resource name.
+# Callable entries build a response from the request parameters.
+_RESOURCE_RESPONSES: Dict[str, Any] = {
+    "unity_info": _text_response(_UNITY_INFO_TEXT),
+    "logs": _logs_response,
+    "object_properties": _object_properties_response,
+}
+
+
+async def _mock_send_command(command: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Look up the mocked response for a send_command call"""
+    if command == "access_resource":
+        name = params.get("resource_name", "")
+        response = _RESOURCE_RESPONSES.get(name)
+        if response is None:
+            return _text_response(f"Unknown resource: {name}", is_error=True)
+        return response(params) if callable(response) else response
+
+    response = _TOOL_RESPONSES.get(command)
+    if response is None:
+        return _text_response(f"Unknown command: {command}", is_error=True)
+    return response
+
+
+# Mock schema response - exactly matching the actual response format
+_SCHEMA_RESPONSE = {
+    "id": "req_3f104d03fe1f42dd9af957826f17b98f",
+    "type": "response",
+    "status": "success",
+    "result": {
+        "content": [
+            {
+                "type": "text",
+                "text": _SCHEMA_JSON_TEXT
+            }
+        ]
+    }
+}
+
+
+# Modified version of the tests for mocked environment
+class TestDynamicToolsMocked:
+    """Test suite for dynamic tools using mocked Unity client"""
+
+    @pytest.fixture(scope="session")
+    def fake_unity_client(self):
+        """Create a fake Unity client for testing without Unity"""
+        return RecordingUnityClient(_SCHEMA_RESPONSE, _mock_send_command)
+
+    @pytest_asyncio.fixture(scope="session", loop_scope="session")
+    async def registered_manager(self, fake_unity_client, mcp_test_instance):
+        """Dynamic tool manager registered once from the mocked schema"""
+        manager = DynamicToolManager(mcp_test_instance, UnityConnectionManager(fake_unity_client))
         result = await manager.register_from_schema()
-            
-        assert result is True, "Failed to register tools from schema"
+        assert result is True, "Failed to register tools from mocked schema"
+        return manager
+
+    @pytest.mark.parametrize("action", ["registered", "tool", "resource"])
+    async def test_mock_all(self, registered_manager, action):
+        """Run one check against the shared registered manager"""
+        if action == "registered":
+            self._check_registration(registered_manager)
+        elif action == "tool":
+            await self._check_tool_invocation(registered_manager.connection_manager)
+        else:
+            await self._check_resource_invocation(registered_manager.connection_manager)
+
+    def _check_registration(self, manager: DynamicToolManager):
+        """Check tools and resources registered from the mocked schema"""
         assert len(manager.registered_tools) > 0, "No tools were registered"
         assert len(manager.registered_resources) > 0, "No resources were registered"
         
@@ -1024,33 +928,11 @@ class TestDynamicToolsMocked:
                 for name in manager.registered_resources), \
             f"No object resource was registered. Resources: {list(manager.registered_resources.keys())}"
     
-    @pytest.mark.asyncio
-    async def test_mock_tool_invocation(self, mock_unity_client, mcp_test_instance):
-        """Test invoking dynamic tools with mocked client"""
-    
-        connection_manager = UnityConnectionManager(mock_unity_client)
-        
-        # Mock the connection manager
-        manager_mock = AsyncMock()
-        manager_mock.reconnect = AsyncMock(return_value=True)
-        manager_mock.execute_with_reconnect = AsyncMock(side_effect=lambda func: func())
-        
-        
-        # Register tools with direct client injection
-        tool_manager = DynamicToolManager(mcp_test_instance, connection_manager)
-        await tool_manager.register_from_schema()
-        
-        # Test invoking tools based on what's available in schema
-        # Try scene_load_scene first, then fall back to editor_execute_code
-        try:
-            result = await DynamicToolInvoker(connection_manager).invoke_tool("scene_load_scene", {"scene_name": "TestScene"})
-            logger.info("Successfully invoked scene_load_scene tool")
-        except Exception as e:
-            logger.warning(f"Failed to invoke scene_load_scene: {str(e)}")
-            # Fall back to editor_execute_code
-            code = "Debug.Log(\\\"Hello\\\"); return 42;"
-            result = await DynamicToolInvoker(connection_manager).invoke_tool("editor_execute_code", {"param1": code})
-            logger.info("Successfully invoked editor_execute_code tool")
+    async def _check_tool_invocation(self, connection_manager: UnityConnectionManager):
+        """Check invoking dynamic tools with mocked client"""
+        invoker = DynamicToolInvoker(connection_manager)
+        # Test invoking scene_load_scene tool
+        result = await invoker.invoke_tool("scene_load_scene", {"scene_name": "TestScene"})
         
         assert result is not None, "Tool invocation returned None"
         # Extract text content if it's in new MCP format
@@ -1058,25 +940,24 @@ class TestDynamicToolsMocked:
             content = result.get("result", {}).get("content", [])
             if content and isinstance(content, list) and content[0].get("type") == "text":
                 text_content = content[0].get("text", "")
-                assert "Result: 42" in text_content, "Execute code did not return expected result"
-    
-    @pytest.mark.asyncio
-    async def test_mock_resource_invocation(self, mock_unity_client, mcp_test_instance):
-        """Test invoking dynamic resources with mocked client"""
-    
-        connection_manager = UnityConnectionManager(mock_unity_client)
-        # Mock the connection manager
-        manager_mock = AsyncMock()
-        manager_mock.reconnect = AsyncMock(return_value=True)
-        manager_mock.execute_with_reconnect = AsyncMock(side_effect=lambda func: func())
+                assert "Scene loaded" in text_content, "Load scene did not return expected result"
         
+        # Test invoking editor_execute_code tool
+        code = "Debug.Log(\\\"Hello\\\"); return 42;"
+        result = await invoker.invoke_tool("editor_execute_code", {"param1": code})
         
-        # Register tools with direct client injection
-        tool_manager = DynamicToolManager(mcp_test_instance, connection_manager)
-        await tool_manager.register_from_schema()
-        
+        assert result is not None, "Tool invocation returned None"
+        if isinstance(result, dict) and isinstance(result.get("result"), dict):
+            content = result.get("result", {}).get("content", [])
+            if content and isinstance(content, list) and content[0].get("type") == "text":
+                text_content = content[0].get("text", "")
+                assert "Result: 42" in text_content, "Execute code did not return expected result"
+    
+    async def _check_resource_invocation(self, connection_manager: UnityConnectionManager):
+        """Check invoking dynamic resources with mocked client"""
+        invoker = DynamicToolInvoker(connection_manager)
         # Test invoking unity_info resource
-        result = await DynamicToolInvoker(connection_manager).invoke_resource("unity_info")
+        result = await invoker.invoke_resource("unity_info")
         
         assert result is not None, "Resource invocation returned None"
         # Extract and validate result
@@ -1087,7 +968,7 @@ class TestDynamicToolsMocked:
                 assert "unityVersion" in text_content, "unity_info resource did not return expected content"
         
         # Test invoking logs resource with parameter
-        result = await DynamicToolInvoker(connection_manager).invoke_resource("logs", {"max_logs": 3})
+        result = await invoker.invoke_resource("logs", {"max_logs": 3})
         
         assert result is not None, "Resource invocation returned None"
         # Extract and validate result
@@ -1098,7 +979,7 @@ class TestDynamicToolsMocked:
                 assert "Log message" in text_content, "logs resource did not return expected content"
         
         # Test multi-parameter resource - use snake_case for parameters
-        result = await DynamicToolInvoker(connection_manager).invoke_resource("object_properties", {
+        result = await invoker.invoke_resource("object_properties", {
             "object_id": "test_cube", 
             "property_name": "position"
         })
@@ -5,18 +5,37 @@ These tests verify the functionality of the MCP server components using
 dependency injection instead of singletons.
 """
 import pytest
-import asyncio
 import unittest.mock as mock
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 import json
-import sys
 
-from mcp.server.fastmcp import FastMCP, Context
+from mcp.server.fastmcp import FastMCP
 from server.mcp_server import mcp, register_dynamic_tools
-from server.unity_tcp_client import UnityTcpClient
-from server.connection_manager import UnityConnectionManager
 from server.dynamic_tools import DynamicToolManager
-from server.dynamic_tool_invoker import DynamicToolInvoker
+
+# Schema served by the mocked client for registration tests
+_SCHEMA = {
+    "tools": [
+        {
+            "name": "execute_code",
+            "description": "Execute C# code in Unity"
+        }
+    ],
+    "resources": [
+        {
+            "name": "unity_info",
+            "description": "Get Unity information",
+            "uri": "unity://info"
+        }
+    ]
+}
+
+# Serialized unity_info payload returned by the mocked client
+_UNITY_INFO_TEXT = json.dumps({
+    "unity_version": "2022.3.1f1",
+    "platform": "Windows",
+    "project_name": "TestProject"
+})
 
 
 def test_mcp_instance():
@@ -26,30 +45,19 @@ def test_mcp_instance():
     assert mcp.settings.lifespan is not None
 
 
+@pytest.fixture(autouse=True)
+def reset_connection_manager(connection_manager):
+    """Reset the session-shared connection manager so each test starts from clean call records"""
+    connection_manager.execute_with_reconnect.reset_mock()
+    yield
+
+
 @pytest.mark.asyncio
-async def test_dynamic_tools_registration():
+async def test_dynamic_tools_registration(mock_unity_client, connection_manager):
     """Test the registration of dynamic tools from schema"""
-    # Create a mock client
-    mock_client = AsyncMock(spec=UnityTcpClient)
-    mock_client.connected = True
-    mock_client.get_schema = AsyncMock(return_value={
-        "tools": [
-            {
-                "name": "execute_code",
-                "description": "Execute C# code in Unity"
-            }
-        ],
-        "resources": [
-            {
-                "name": "unity_info",
-                "description": "Get Unity information",
-                "uri": "unity://info"
-            }
-        ]
-    })
+    mock_unity_client.get_schema.return_value = _SCHEMA
     
-    # Create tool manager with our MCP instance and mock client
-    connection_manager = UnityConnectionManager(mock_client)
+    # Create tool manager with our MCP instance and the shared connection manager
     tool_manager = DynamicToolManager(mcp, connection_manager)
     
     # Register dynamic tools
@@ -60,119 +68,61 @@ async def test_dynamic_tools_registration():
     assert "unity_info" in tool_manager.registered_resources
     
     # Verify the schema was retrieved
-    mock_client.get_schema.assert_called_once()
+    mock_unity_client.get_schema.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_dynamic_tool_invocation():
-    """Test invoking a dynamic tool through the DynamicToolInvoker"""
-    # Create mock client
-    mock_client = AsyncMock(spec=UnityTcpClient)
-    mock_client.connected = True
-    mock_client.send_command = AsyncMock(return_value={
+@pytest.mark.parametrize("kind,name,payload,response_text,expected_command", [
+    (
+        "tool",
+        "execute_code",
+        {"code": "Debug.Log(\"Test\");"},
+        "Code executed successfully",
+        ("execute_code", {"code": "Debug.Log(\"Test\");"}),
+    ),
+    (
+        "resource",
+        "unity_info",
+        {},
+        _UNITY_INFO_TEXT,
+        ("access_resource", {"resource_name": "unity_info", "parameters": {}}),
+    ),
+])
+async def test_dynamic_invocation(mock_unity_client, invoker, stub_ctx, monkeypatch, kind, name, payload, response_text, expected_command):
+    """Test invoking a dynamic tool or resource through the DynamicToolInvoker"""
+    response = {
         "result": {
             "content": [
                 {
                     "type": "text",
-                    "text": "Code executed successfully"
+                    "text": response_text
                 }
             ],
             "isError": False
         }
-    })
+    }
     
-    # Create mock context
-    ctx = AsyncMock(spec=Context)
-    ctx.info = AsyncMock()
-    ctx.error = AsyncMock()
+    # Record commands sent to Unity and answer each with the canned response
+    calls = []
+    async def send_command(command, params):
+        calls.append((command, params))
+        return response
+    monkeypatch.setattr(mock_unity_client, "send_command", send_command)
     
-    # Create connection manager and invoker
-    connection_manager = UnityConnectionManager(mock_client)
-    # Make execute_with_reconnect actually await the coroutine and return the result
-    async def execute_with_reconnect_side_effect(func):
-        return await func()
-    connection_manager.execute_with_reconnect = AsyncMock(side_effect=execute_with_reconnect_side_effect)
-    tool_invoker = DynamicToolInvoker(connection_manager)
-    
-    # Invoke a tool
-    code = "Debug.Log(\"Test\");"
-    result = await tool_invoker.invoke_dynamic_tool("execute_code", {"code": code}, ctx)
+    # Invoke the tool or resource
+    result = await getattr(invoker, f"invoke_{kind}")(name, payload, stub_ctx)
     
     # Verify the result
     assert result is not None
     assert "result" in result
     assert "content" in result["result"]
     assert not result["result"]["isError"]
-    assert "Code executed successfully" in result["result"]["content"][0]["text"]
+    assert not stub_ctx.error_calls
+    assert result["result"]["content"][0]["text"] == response_text
     
     # Verify the client was called with the right parameters
-    mock_client.send_command.assert_called_once_with("execute_code", {"code": code})
-
-
-@pytest.mark.asyncio
-async def test_dynamic_resource_access():
-    """Test accessing a dynamic resource through the DynamicToolInvoker"""
-    # Create mock client
-    mock_client = AsyncMock(spec=UnityTcpClient)
-    mock_client.connected = True
-    mock_client.send_command = AsyncMock(return_value={
-        "result": {
-            "content": [
-                {
-                    "type": "text",
-                    "text": json.dumps({
-                        "unity_version": "2022.3.1f1",
-                        "platform": "Windows",
-                        "project_name": "TestProject"
-                    })
-                }
-            ],
-            "isError": False
-        }
-    })
-    
-    # Create mock context
-    ctx = AsyncMock(spec=Context)
-    ctx.info = AsyncMock()
-    ctx.error = AsyncMock()
-    
-    # Create connection manager and invoker
-    connection_manager = UnityConnectionManager(mock_client)
-    # Make execute_with_reconnect actually await the coroutine and return the result
-    async def execute_with_reconnect_side_effect(func):
-        return await func()
-    connection_manager.execute_with_reconnect = AsyncMock(side_effect=execute_with_reconnect_side_effect)
-    tool_invoker = DynamicToolInvoker(connection_manager)
-    
-    # Access a resource
-    result = await tool_invoker.invoke_dynamic_resource("unity_info", {}, ctx)
-    
-    # Verify the result
-    assert result is not None
-    assert "result" in result
-    assert "content" in result["result"]
-    assert not result["result"]["isError"]
-    
-    # Check the JSON structure
-    content_text = result["result"]["content"][0]["text"]
-    info_data = json.loads(content_text)
-    assert info_data["unity_version"] == "2022.3.1f1"
-    assert info_data["platform"] == "Windows"
-    assert info_data["project_name"] == "TestProject"
-    
-    # Verify the client was called with the right parameters
-    mock_client.send_command.assert_called_once_with("access_resource", {
-        "resource_name": "unity_info",
-        "parameters": {}
-    })
-
+    assert calls == [expected_command]
 
-# Helper to configure asyncio for Windows
-def pytest_configure(config):
-    """Configure pytest for async tests"""
-    # Set Windows event loop policy if needed
-    if sys.platform == 'win32':
-        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 if __name__ == "__main__":
     # Run the tests
@@ -1,11 +1,10 @@
-"""Test thread-local context handling for resources"""
+"""Test per-thread and per-task context handling for resources"""
 
 import asyncio
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import pytest
-import sys
-import sys
 from typing import Dict, Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -13,8 +12,6 @@ from server.resource_context import ResourceContext
 from server.dynamic_tools import DynamicToolManager
 from mcp.server.fastmcp import Context
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("test_resource_context")
 
 # Test context data
@@ -36,7 +33,7 @@ class MockContext:
         return self.logs
 
 class TestResourceContext:
-    """Tests for ResourceContext thread-local storage"""
+    """Tests for ResourceContext context variable storage"""
     
     def test_single_thread_context(self):
         """Test context handling in a single thread"""
@@ -101,74 +98,39 @@ class TestResourceContext:
         # Verify context cleared after exception
         assert ResourceContext.get_current_ctx() is None
     
-    def test_multi_thread_isolation(self):
+    @pytest.mark.parametrize("thread_count", [2, 4, 8])
+    def test_multi_thread_isolation(self, thread_count):
         """Test that contexts are isolated between threads"""
         # Make sure we start with a clean state
         ResourceContext.clear_all_contexts()
-        ctx1 = MockContext("thread1")
-        ctx2 = MockContext("thread2")
+        contexts = [MockContext(f"thread{i}") for i in range(thread_count)]
+        # Each task blocks on the barrier, so the pool must run them all on separate threads
+        barrier = threading.Barrier(thread_count, timeout=5)
         
-        results = {}
-        threads_ready = threading.Event()
-        threads_finished = threading.Event()
-        thread_count = 2
+        def current_context_id():
+            ctx = ResourceContext.get_current_ctx()
+            return ctx.context_id if ctx else None
         
-        def thread_func(thread_id, ctx):
-            # Save our id -> context mapping
-            results[thread_id] = {
-                "ctx": ctx,
-                "seen_contexts": []
-            }
-            
-            # Set context for this thread
+        def thread_func(ctx):
+            # Set context for this thread and report it
             ResourceContext.set_current_ctx(ctx)
+            seen_contexts = [current_context_id()]
             
-            # Report initial context
-            results[thread_id]["seen_contexts"].append(
-                ResourceContext.get_current_ctx().context_id if ResourceContext.get_current_ctx() else None
-            )
-            
-            # Signal ready and wait for all threads
-            threads_ready.set()
-            threads_ready.wait()
-            
-            # Sleep a bit to allow threads to interleave
-            import time
-            time.sleep(0.01)
-            
-            # Check context again
-            results[thread_id]["seen_contexts"].append(
-                ResourceContext.get_current_ctx().context_id if ResourceContext.get_current_ctx() else None
-            )
-            
-            # Signal done and wait for all threads
-            threads_finished.set()
-            threads_finished.wait()
+            # Wait until every thread has set its own context
+            barrier.wait()
+            seen_contexts.append(current_context_id())
             
-            # Final context check
-            results[thread_id]["seen_contexts"].append(
-                ResourceContext.get_current_ctx().context_id if ResourceContext.get_current_ctx() else None
-            )
+            # Wait until every thread has checked its context again
+            barrier.wait()
+            seen_contexts.append(current_context_id())
+            return seen_contexts
         
-        # Start threads
-        t1 = threading.Thread(target=thread_func, args=(1, ctx1))
-        t2 = threading.Thread(target=thread_func, args=(2, ctx2))
-        
-        t1.start()
-        t2.start()
-        
-        # Wait for threads to finish
-        t1.join()
-        t2.join()
+        with ThreadPoolExecutor(max_workers=thread_count) as executor:
+            results = list(executor.map(thread_func, contexts))
         
         # Verify thread isolation
-        assert results[1]["seen_contexts"][0] == "thread1"
-        assert results[1]["seen_contexts"][1] == "thread1"
-        assert results[1]["seen_contexts"][2] == "thread1"
-        
-        assert results[2]["seen_contexts"][0] == "thread2"
-        assert results[2]["seen_contexts"][1] == "thread2"
-        assert results[2]["seen_contexts"][2] == "thread2"
+        for ctx, seen_contexts in zip(contexts, results):
+            assert seen_contexts == [ctx.context_id] * 3
 
 @pytest.mark.asyncio
 async def test_async_context():
@@ -263,9 +225,5 @@ async def test_resource_wrapper():
 
 # Run tests if executed directly
 if __name__ == "__main__":
-    # Set Windows event loop policy if needed
-    if sys.platform == 'win32':
-        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    
     # Run the tests
     pytest.main(["-xvs", __file__])
\ No newline at end of file
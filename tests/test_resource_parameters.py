@@ -2,127 +2,83 @@
 
 import json
 import pytest
+import pytest_asyncio
 import logging
-import asyncio
-import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from mcp.server.fastmcp import FastMCP, Context
+from mcp.server.fastmcp import FastMCP
 from server.resource_context import ResourceContext
 from server.connection_manager import UnityConnectionManager
 from server.dynamic_tools import DynamicToolManager
 from server.dynamic_tool_invoker import DynamicToolInvoker
+from tests.helpers import RecordingUnityClient
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("test_resource_parameters")
 
-# Test data
-TEST_SCHEMA = {
-    "tools": [
-        {
-            "name": "execute_code",
-            "description": "Executes C# code in Unity",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "code": {
-                        "type": "string",
-                        "description": "C# code to execute"
-                    }
-                },
-                "required": ["code"]
-            }
-        }
-    ],
-    "resources": [
-        {
-            "name": "unity_info",
-            "description": "Get Unity information",
-            "uri": "unity://info"
-        },
-        {
-            "name": "logs",
-            "description": "Get Unity logs",
-            "uri": "unity://logs/{max_logs}"
-        },
-        {
-            "name": "object_properties",
-            "description": "Get GameObject properties",
-            "uri": "unity://gameobject/{id}/properties/{property_name}"
-        },
-        {
-            "name": "scene",
-            "description": "Get scene information with optional parameters",
-            "uri": "unity://scene/{scene_name}/{detail_level}"
-        }
-    ]
-}
-
-# Create test fixtures
-
-@pytest.fixture
-def mock_client():
-    """Create a mock Unity client"""
-    client = AsyncMock()
-    client.get_schema = AsyncMock(return_value=TEST_SCHEMA)
-    client.send_command = AsyncMock(side_effect=lambda cmd, params: {
-        "command": cmd,
-        "params": params,
-        "result": "success" 
-    })
-    client.connected = True
-    client.has_command = AsyncMock(return_value=True)
-    return client
+# Commands the invoker is expected to send, with parameters normalized to camelCase
+_EXPECTED_INVOKER_CALLS = (
+    ("access_resource", {
+        "resource_name": "unity_info",
+        "parameters": {}
+    }),
+    ("access_resource", {
+        "resource_name": "logs",
+        "parameters": {"maxLogs": 5}
+    }),
+    ("access_resource", {
+        "resource_name": "object_properties",
+        "parameters": {"id": "cube01", "propertyName": "position"}
+    }),
+)
 
-@pytest.fixture
-def mock_fastmcp():
-    """Create a mock FastMCP instance"""
-    mcp = MagicMock()
-    
-    # Make resource decorator track registered resources
-    mcp.registered_resources = {}
-    
+def _make_resource_decorator(store):
+    """Build a FastMCP-style resource decorator that records into store"""
     def resource_decorator(url_pattern, description=""):
         def decorator(func):
             # Store the registered resource
-            resource_name = url_pattern.split('://')[-1].split('/')[0]
-            mcp.registered_resources[resource_name] = {
+            resource_name = url_pattern.rpartition('://')[2].partition('/')[0]
+            store[resource_name] = {
                 "url_pattern": url_pattern,
                 "description": description,
                 "func": func
             }
             return func
         return decorator
-    
-    mcp.resource = resource_decorator
-    
-    # Make tool decorator track registered tools
-    mcp.registered_tools = {}
-    
+    return resource_decorator
+
+def _make_tool_decorator(store):
+    """Build a FastMCP-style tool decorator that records into store"""
     def tool_decorator(name, description=""):
         def decorator(func):
             # Store the registered tool
-            mcp.registered_tools[name] = {
+            store[name] = {
                 "description": description,
                 "func": func
             }
             return func
         return decorator
+    return tool_decorator
+
+# Create test fixtures
+
+@pytest.fixture(scope="session")
+def mock_client():
+    """Create a recording Unity client"""
+    return RecordingUnityClient()
+
+@pytest.fixture(scope="session")
+def mock_fastmcp():
+    """Create a mock FastMCP instance"""
+    mcp = MagicMock()
     
-    mcp.tool = tool_decorator
+    # Make resource and tool decorators track registrations
+    mcp.registered_resources = {}
+    mcp.resource = _make_resource_decorator(mcp.registered_resources)
+    mcp.registered_tools = {}
+    mcp.tool = _make_tool_decorator(mcp.registered_tools)
     
     return mcp
 
-@pytest.fixture
-def mock_context():
-    """Create a mock Context object"""
-    ctx = MagicMock(spec=Context)
-    ctx.info = AsyncMock()
-    ctx.error = AsyncMock()
-    ctx.debug = AsyncMock()
-    return ctx
-
 @pytest.fixture
 def dynamic_manager(mock_fastmcp, mock_client):
     """Create a DynamicToolManager with mocked dependencies"""
@@ -131,6 +87,20 @@ def dynamic_manager(mock_fastmcp, mock_client):
     manager = DynamicToolManager(mock_fastmcp, connection_manager)
     return manager
 
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def registered_manager(mock_fastmcp, mock_client):
+    """Create a DynamicToolManager that has already registered TEST_SCHEMA"""
+    manager = DynamicToolManager(mock_fastmcp, UnityConnectionManager(mock_client))
+    await manager.register_from_schema()
+    return manager
+
+@pytest.fixture(autouse=True)
+def reset_mocks(mock_client, mock_fastmcp):
+    """Clear call history and registrations left behind by the previous test"""
+    mock_client.reset_mock()
+    mock_fastmcp.registered_resources.clear()
+    mock_fastmcp.registered_tools.clear()
+
 # Tests for resource parameter handling
 
 @pytest.mark.asyncio
@@ -156,88 +126,33 @@ async def test_register_from_schema(dynamic_manager, mock_client):
     assert "execute_code" in dynamic_manager.registered_tools
 
 @pytest.mark.asyncio
-async def test_no_parameter_resource(dynamic_manager, mock_client, mock_context):
-    """Test registering and calling a resource with no parameters"""
-    # Register schema
-    await dynamic_manager.register_from_schema()
-    
-    # Test no-parameter resource (unity://info)
-    resource_name = "unity_info"
-    
+@pytest.mark.parametrize("resource_name,args,expected_params", [
+    # No-parameter resource (unity://info)
+    ("unity_info", (), {}),
+    # Single-parameter resource (unity://logs/{max_logs})
+    ("logs", (10,), {"max_logs": 10}),
+    # Multi-parameter resource (unity://gameobject/{id}/properties/{property_name})
+    ("object_properties", ("cube01", "position"), {"id": "cube01", "property_name": "position"}),
+])
+async def test_parameter_resource(registered_manager, mock_client, stub_ctx, resource_name, args, expected_params):
+    """Test calling registered resources with zero, one and several parameters"""
     # Get the registered function
-    registered_func = dynamic_manager.registered_resources[resource_name]["func"]
-    
-    # Call the function with the context
-    with ResourceContext.with_context(mock_context):
-        result = await registered_func(mock_context)
-    
-    # Verify the client was called correctly
-    mock_client.send_command.assert_called_with("access_resource", {
-        "resource_name": resource_name,
-        "parameters": {}
-    })
-    
-    # Check result
-    assert result["command"] == "access_resource"
-    assert result["result"] == "success"
-
-@pytest.mark.asyncio
-async def test_single_parameter_resource(dynamic_manager, mock_client, mock_context):
-    """Test registering and calling a resource with a single parameter"""
-    # Register schema
-    await dynamic_manager.register_from_schema()
-    
-    # Test single-parameter resource (unity://logs/{max_logs})
-    resource_name = "logs"
-    
-    # Get the registered function
-    registered_func = dynamic_manager.registered_resources[resource_name]["func"]
-    
-    # Call the function with the context and parameter
-    max_logs = 10
-    with ResourceContext.with_context(mock_context):
-        result = await registered_func(mock_context, max_logs)
-    
-    # Verify the client was called correctly
-    mock_client.send_command.assert_called_with("access_resource", {
-        "resource_name": resource_name,
-        "parameters": {"max_logs": max_logs}
-    })
-    
-    # Check result
-    assert result["command"] == "access_resource"
-    assert result["result"] == "success"
-    assert result["params"]["parameters"]["max_logs"] == max_logs
-
-@pytest.mark.asyncio
-async def test_multi_parameter_resource(dynamic_manager, mock_client, mock_context):
-    """Test registering and calling a resource with multiple parameters"""
-    # Register schema
-    await dynamic_manager.register_from_schema()
-    
-    # Test multi-parameter resource (unity://gameobject/{id}/properties/{property_name})
-    resource_name = "object_properties"
-    
-    # Get the registered function
-    registered_func = dynamic_manager.registered_resources[resource_name]["func"]
+    registered_func = registered_manager.registered_resources[resource_name]["func"]
     
     # Call the function with the context and parameters
-    id_value = "cube01"
-    property_name = "position"
-    with ResourceContext.with_context(mock_context):
-        result = await registered_func(mock_context, id_value, property_name)
+    with ResourceContext.with_context(stub_ctx):
+        result = await registered_func(stub_ctx, *args)
     
     # Verify the client was called correctly
-    mock_client.send_command.assert_called_with("access_resource", {
+    assert mock_client.calls[-1] == ("access_resource", {
         "resource_name": resource_name,
-        "parameters": {"id": id_value, "property_name": property_name}
+        "parameters": expected_params
     })
     
     # Check result
     assert result["command"] == "access_resource"
     assert result["result"] == "success"
-    assert result["params"]["parameters"]["id"] == id_value
-    assert result["params"]["parameters"]["property_name"] == property_name
+    assert result["params"]["parameters"] == expected_params
 
 @pytest.mark.asyncio
 async def test_invoke_dynamic_resource(mock_client):
@@ -249,31 +164,17 @@ async def test_invoke_dynamic_resource(mock_client):
 
     connection_manager = UnityConnectionManager(mock_client)
     
-    # Test different parameter counts
-    
-    # No parameters
-    result = await DynamicToolInvoker(connection_manager).invoke_dynamic_resource("unity_info")
-    mock_client.send_command.assert_called_with("access_resource", {
-        "resource_name": "unity_info",
-        "parameters": {}
-    })
+    invoker = DynamicToolInvoker(connection_manager)
     
-    # Single parameter (parameters are normalized to camelCase)
-    result = await DynamicToolInvoker(connection_manager).invoke_dynamic_resource("logs", {"max_logs": 5})
-    mock_client.send_command.assert_called_with("access_resource", {
-        "resource_name": "logs",
-        "parameters": {"maxLogs": 5}
-    })
-    
-    # Multiple parameters
-    result = await DynamicToolInvoker(connection_manager).invoke_dynamic_resource("object_properties", {
+    # Test different parameter counts: none, single and multiple
+    await invoker.invoke_resource("unity_info")
+    await invoker.invoke_resource("logs", {"max_logs": 5})
+    await invoker.invoke_resource("object_properties", {
         "id": "cube01", 
         "property_name": "position"
     })
-    mock_client.send_command.assert_called_with("access_resource", {
-        "resource_name": "object_properties",
-        "parameters": {"id": "cube01", "propertyName": "position"}
-    })
+    
+    assert tuple(mock_client.calls) == _EXPECTED_INVOKER_CALLS
 
 @pytest.mark.asyncio
 async def test_resource_context_manager():
@@ -313,43 +214,36 @@ async def test_resource_context_manager():
     assert ResourceContext.get_current_ctx() is None
 
 @pytest.mark.asyncio
-async def test_parameter_mismatch_handling(dynamic_manager, mock_client, mock_context):
+async def test_parameter_mismatch_handling(registered_manager, mock_client, stub_ctx):
     """Test handling of parameter mismatches between URI and actual parameters"""
-    # Register schema
-    await dynamic_manager.register_from_schema()
-    
     # Test multi-parameter resource
     resource_name = "scene"
     
     # Get the registered function
-    registered_func = dynamic_manager.registered_resources[resource_name]["func"]
+    registered_func = registered_manager.registered_resources[resource_name]["func"]
     
     # Call with all parameters
-    with ResourceContext.with_context(mock_context):
-        result = await registered_func(mock_context, "main", "high")
+    with ResourceContext.with_context(stub_ctx):
+        result = await registered_func(stub_ctx, "main", "high")
     
     # Verify correct call
-    mock_client.send_command.assert_called_with("access_resource", {
+    assert mock_client.calls[-1] == ("access_resource", {
         "resource_name": resource_name,
         "parameters": {"scene_name": "main", "detail_level": "high"}
     })
     
-    # Reset mock
-    mock_client.send_command.reset_mock()
+    # Reset recorded calls
+    mock_client.calls.clear()
     
     # Try calling with missing parameters
     with pytest.raises(TypeError):
-        with ResourceContext.with_context(mock_context):
-            result = await registered_func(mock_context, "main")
+        with ResourceContext.with_context(stub_ctx):
+            result = await registered_func(stub_ctx, "main")
     
     # Verify the client was not called
-    mock_client.send_command.assert_not_called()
+    assert not mock_client.calls
     
 # Run tests if executed directly
 if __name__ == "__main__":
-    # Set Windows event loop policy if needed
-    if sys.platform == 'win32':
-        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    
     # Run the tests
     pytest.main(["-xvs", __file__])
\ No newline at end of file
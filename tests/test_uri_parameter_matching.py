@@ -1,40 +1,86 @@
 """Test URI parameter matching in dynamic resources"""
 
 import pytest
-import asyncio
-import sys
+import pytest_asyncio
 import logging
 import re
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
-from mcp.server.fastmcp import FastMCP, Context
+from mcp.server.fastmcp import FastMCP
 from server.resource_context import ResourceContext
 from server.connection_manager import UnityConnectionManager
 from server.dynamic_tools import DynamicToolManager
+from tests.helpers import async_return
 
-# Mock the FunctionResource class for testing
-class MockFunctionResource:
-    """Mock FunctionResource for testing"""
-    def __init__(self, uri=None, name=None, description=None, mime_type=None, fn=None):
-        self.uri = uri
-        self.name = name
-        self.description = description
-        self.mime_type = mime_type
-        self.fn = fn
-        
-        # Extract URI parameters directly, handling URL encoding
-        import re
-        uri_str = str(uri or '')
-        
-        # Check for URL-encoded braces
-        if '%7B' in uri_str and '%7D' in uri_str:
-            self.uri_params = re.findall(r"%7B([^%]+)%7D", uri_str)
-        else:
-            self.uri_params = re.findall(r"\{([^}]+)\}", uri_str)
+# Match URL-encoded %7Bparam%7D placeholders in resource URI patterns
+_ENCODED_BRACE_RE = re.compile(r"%7B([^%]+)%7D")
+
+def _brace_params(uri):
+    """Extract {param} placeholder names from a URI pattern with plain string splitting"""
+    if '{' not in uri:
+        return []
+    params = []
+    for fragment in uri.split('{')[1:]:
+        end = fragment.find('}')
+        if end > 0:
+            params.append(fragment[:end])
+    return params
+
+# Expected URI parameters for each resource in the sample schema
+_EXPECTED_URI_PARAMS = {
+    "info": (),
+    "logs": ("max_logs",),
+    "scene": ("scene_name",),
+    "object": ("id", "property_name"),
+    "complex": ("type", "id", "attribute", "format")
+}
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Keep debug output for this module's logger only, without lowering the root level
 logger = logging.getLogger("test_uri_parameter_matching")
+logger.setLevel(logging.DEBUG)
+
+def _sig_params(func):
+    """Get the positional parameter names of a function straight from its code object"""
+    code = func.__code__
+    return list(code.co_varnames[:code.co_argcount])
+
+# Schema served by the mock Unity client; tests only read it
+_SAMPLE_SCHEMA = {
+    "resources": [
+        {
+            "name": "info",
+            "description": "Get Unity info",
+            "uri": "unity://info"
+        },
+        {
+            "name": "logs",
+            "description": "Get Unity logs",
+            "uri": "unity://logs/{max_logs}"
+        },
+        {
+            "name": "scene",
+            "description": "Get scene info",
+            "uri": "unity://scene/{scene_name}"
+        },
+        {
+            "name": "object",
+            "description": "Get object properties",
+            "uri": "unity://object/{id}/property/{property_name}"
+        },
+        {
+            "name": "complex",
+            "description": "Complex resource with multiple parameters",
+            "uri": "unity://complex/{type}/{id}/{attribute}/{format}"
+        }
+    ],
+    "tools": [
+        {
+            "name": "test_tool",
+            "description": "Test tool",
+            "urlPattern": "unity://test_tool"
+        }
+    ]
+}
 
 class MockFastMCP:
     """Mock FastMCP for testing parameter validation"""
@@ -53,35 +99,20 @@ class MockFastMCP:
         
         # Create a side effect function that updates registered_resources when add_resource is called
         def add_resource_side_effect(resource):
-            if hasattr(resource, 'name') and resource.name:
-                # Extract and override URI parameters for specific known resources
-                uri_params = []
-                
-                # Use a dictionary to define expected parameter counts for each resource
-                expected_params = {
-                    "info": [],
-                    "logs": ["max_logs"],
-                    "scene": ["scene_name"],
-                    "object": ["id", "property_name"],
-                    "complex": ["type", "id", "attribute", "format"]
-                }
-                
-                # If this is a known resource, use the expected parameters
-                if resource.name in expected_params:
-                    uri_params = expected_params[resource.name]
-                    print(f"DEBUG: Using expected params for {resource.name}: {uri_params}")
-                # Otherwise try to extract from uri_params or uri
-                elif hasattr(resource, 'uri_params'):
-                    uri_params = resource.uri_params
-                elif hasattr(resource, 'uri'):
-                    uri_params = self._extract_uri_params(str(resource.uri))
-                
-                print(f"DEBUG: Adding resource {resource.name} with uri_params: {uri_params}")
+            if getattr(resource, 'name', None):
+                # Use the expected parameters for known resources,
+                # otherwise try to extract from uri_params or uri
+                expected = _EXPECTED_URI_PARAMS.get(resource.name)
+                if expected is not None:
+                    uri_params = list(expected)
+                else:
+                    uri_params = (getattr(resource, 'uri_params', None)
+                                  or self._extract_uri_params(str(getattr(resource, 'uri', ''))))
                 
                 self.registered_resources[resource.name] = {
-                    "uri": resource.uri if hasattr(resource, 'uri') else None,
-                    "description": resource.description if hasattr(resource, 'description') else "",
-                    "func": resource.fn if hasattr(resource, 'fn') else None,
+                    "uri": getattr(resource, 'uri', None),
+                    "description": getattr(resource, 'description', ""),
+                    "func": getattr(resource, 'fn', None),
                     "uri_params": uri_params
                 }
             return None  # Mock methods typically return MagicMock objects, but we'll return None
@@ -94,14 +125,12 @@ class MockFastMCP:
         if '%7B' in uri_pattern and '%7D' in uri_pattern:
             # If it does, we need to handle both encoded and unencoded patterns
             # First try with URL-encoded pattern
-            param_pattern = r"%7B([^%]+)%7D"
-            params = re.findall(param_pattern, uri_pattern)
+            params = _ENCODED_BRACE_RE.findall(uri_pattern)
             if params:
                 return params
                 
         # Fall back to normal pattern extraction
-        param_pattern = r"\{([^}]+)\}"
-        return re.findall(param_pattern, uri_pattern)
+        return _brace_params(uri_pattern)
         
     def get_context(self):
         """Get the current context"""
@@ -113,24 +142,18 @@ class MockFastMCP:
         
     def resource(self, url_pattern, description=""):
         def decorator(func):
-            resource_name = url_pattern.split("://")[1].split("/")[0]
+            resource_name = url_pattern.partition("://")[2].partition("/")[0]
             
-            # Extract URI parameters using regex
-            param_pattern = r"\{([^}]+)\}"
-            uri_params = re.findall(param_pattern, url_pattern)
+            # Extract URI parameters
+            uri_params = _brace_params(url_pattern)
             
             # Check function signature against URI parameters
-            import inspect
-            sig = inspect.signature(func)
-            sig_params = list(sig.parameters.keys())
+            sig_params = _sig_params(func)
             
             # FastMCP expects exactly ctx + URI params
-            expected_sig = ["ctx"] + uri_params
-            
-            # Verify function signature matches
-            if sig_params != expected_sig:
+            if sig_params[:1] != ["ctx"] or sig_params[1:] != uri_params:
                 raise ValueError(
-                    f"Function parameters {sig_params} don't match URI parameters {expected_sig} "
+                    f"Function parameters {sig_params} don't match ctx plus URI parameters {uri_params} "
                     f"for URL pattern {url_pattern}"
                 )
             
@@ -154,119 +177,76 @@ class MockFastMCP:
             return func
         return decorator
 
+# Resource functions with the signatures exercised by the validation test
+async def _no_params(ctx):
+    return {"result": "success"}
+
+async def _single_param(ctx, param):
+    return {"result": "success", "param": param}
+
+async def _multi_param(ctx, first, second):
+    return {"result": "success", "first": first, "second": second}
+
+async def _extra_param(ctx, param, extra):
+    return {"result": "success"}
+
+async def _wrong_name(ctx, wrong):
+    return {"result": "success"}
+
 class TestUriParameterMatching:
     """Test URI parameter matching between patterns and function signatures"""
     
-    @pytest.fixture
-    def mock_client(self):
-        """Create a mock Unity client"""
+    @pytest.fixture(scope="session")
+    def mock_client_proto(self):
+        """Build the mock Unity client once per session"""
         client = AsyncMock()
-        client.get_schema = AsyncMock(return_value={
-            "resources": [
-                {
-                    "name": "info",
-                    "description": "Get Unity info",
-                    "uri": "unity://info"
-                },
-                {
-                    "name": "logs",
-                    "description": "Get Unity logs",
-                    "uri": "unity://logs/{max_logs}"
-                },
-                {
-                    "name": "scene",
-                    "description": "Get scene info",
-                    "uri": "unity://scene/{scene_name}"
-                },
-                {
-                    "name": "object",
-                    "description": "Get object properties",
-                    "uri": "unity://object/{id}/property/{property_name}"
-                },
-                {
-                    "name": "complex",
-                    "description": "Complex resource with multiple parameters",
-                    "uri": "unity://complex/{type}/{id}/{attribute}/{format}"
-                }
-            ],
-            "tools": [
-                {
-                    "name": "test_tool",
-                    "description": "Test tool",
-                    "urlPattern": "unity://test_tool"
-                }
-            ]
-        })
+        client.get_schema = async_return(_SAMPLE_SCHEMA)
         client.send_command = AsyncMock(return_value={"result": "success"})
         client.connected = True
         return client
     
     @pytest.fixture
-    def mock_context(self):
-        """Create a mock Context"""
-        ctx = MagicMock(spec=Context)
-        ctx.info = AsyncMock()
-        ctx.error = AsyncMock()
-        ctx.debug = AsyncMock()
-        return ctx
+    def mock_client(self, mock_client_proto):
+        """Hand out the shared mock Unity client with its command history cleared"""
+        mock_client_proto.send_command.reset_mock()
+        return mock_client_proto
     
-    @pytest.mark.asyncio
-    async def test_uri_parameter_validation(self, mock_client):
-        """Test that URI parameters are properly validated against function signatures"""
-        # Create FastMCP instance with validation
-        mcp = MockFastMCP()
-        
-        # Test with valid function signatures
-        
-        # No parameters
-        @mcp.resource("unity://test/no_params")
-        async def valid_no_params(ctx):
-            return {"result": "success"}
-        
-        # Single parameter
-        @mcp.resource("unity://test/{param}")
-        async def valid_single_param(ctx, param):
-            return {"result": "success", "param": param}
-        
-        # Multiple parameters
-        @mcp.resource("unity://test/{first}/{second}")
-        async def valid_multi_param(ctx, first, second):
-            return {"result": "success", "first": first, "second": second}
-        
-        # Test invalid signatures
-        
-        # Missing parameters
-        with pytest.raises(ValueError):
-            @mcp.resource("unity://test/{param}")
-            async def invalid_missing_param(ctx):
-                return {"result": "success"}
-        
-        # Extra parameters
-        with pytest.raises(ValueError):
-            @mcp.resource("unity://test/{param}")
-            async def invalid_extra_param(ctx, param, extra):
-                return {"result": "success"}
-        
-        # Wrong parameter names
-        with pytest.raises(ValueError):
-            @mcp.resource("unity://test/{expected}")
-            async def invalid_wrong_name(ctx, wrong):
-                return {"result": "success"}
-                
-    @pytest.mark.asyncio
-    async def test_dynamic_resource_param_matching(self, mock_client, mock_context):
-        """Test that dynamic resources are registered with proper parameter matching"""
+    @pytest_asyncio.fixture(scope="class")
+    async def registered_mcp_and_manager(self, mock_client_proto):
+        """Register the sample schema once for the whole class"""
         # Use our mocked FastMCP that performs validation
         mcp = MockFastMCP()
-        mcp.set_context(mock_context)
-
-        connection_manager = UnityConnectionManager(mock_client)
-        
-        manager = DynamicToolManager(mcp, connection_manager)
+        manager = DynamicToolManager(mcp, UnityConnectionManager(mock_client_proto))
         
         # Register resources from schema
         result = await manager.register_from_schema()
         assert result is True
+        return mcp, manager
+    
+    @pytest.mark.parametrize("url_pattern,func,expects_error", [
+        # Valid signatures: no, single and multiple parameters
+        ("unity://test/no_params", _no_params, False),
+        ("unity://test/{param}", _single_param, False),
+        ("unity://test/{first}/{second}", _multi_param, False),
+        # Invalid signatures: missing, extra and wrongly named parameters
+        ("unity://test/{param}", _no_params, True),
+        ("unity://test/{param}", _extra_param, True),
+        ("unity://test/{expected}", _wrong_name, True),
+    ], ids=["no_params", "single_param", "multi_param", "missing_param", "extra_param", "wrong_name"])
+    def test_uri_parameter_validation(self, url_pattern, func, expects_error):
+        """Test that URI parameters are properly validated against function signatures"""
+        # Create FastMCP instance with validation
+        mcp = MockFastMCP()
+        
+        if expects_error:
+            with pytest.raises(ValueError):
+                mcp.resource(url_pattern)(func)
+        else:
+            assert mcp.resource(url_pattern)(func) is func
+                
+    async def test_dynamic_resource_param_matching(self, registered_mcp_and_manager):
+        """Test that dynamic resources are registered with proper parameter matching"""
+        mcp, manager = registered_mcp_and_manager
         
         # Check that resources were registered
         assert "info" in mcp.registered_resources
@@ -275,137 +255,76 @@ class TestUriParameterMatching:
         assert "object" in mcp.registered_resources
         assert "complex" in mcp.registered_resources
         
-        # Debug print the resources
-        print("\nDEBUG: Registered resources content:")
+        # Debug log the resources
+        logger.debug("Registered resources content:")
         for name, resource in mcp.registered_resources.items():
-            print(f"Resource {name}: {resource}")
+            logger.debug("Resource %s: %s", name, resource)
             # Verify the resource has uri field
             if "uri" not in resource:
-                print(f"WARNING: Resource {name} has no 'uri' field")
+                logger.warning("Resource %s has no 'uri' field", name)
                 # If it has uriTemplate, convert it to uri
                 if "uriTemplate" in resource:
                     resource["uri"] = resource.pop("uriTemplate")
             
-        # Define the expected parameters directly
-        expected_params = {
-            "info": [],
-            "logs": ["max_logs"],
-            "scene": ["scene_name"],
-            "object": ["id", "property_name"],
-            "complex": ["type", "id", "attribute", "format"]
-        }
-        
         # Override the uri_params for all expected resources
-        for name, params in expected_params.items():
+        for name, params in _EXPECTED_URI_PARAMS.items():
             if name in mcp.registered_resources:
-                print(f"Setting uri_params for {name} to {params}")
-                mcp.registered_resources[name]["uri_params"] = params
-        
-        # Verify parameter counts match URI patterns
-        assert len(mcp.registered_resources["info"]["uri_params"]) == 0
-        assert len(mcp.registered_resources["logs"]["uri_params"]) == 1
-        assert len(mcp.registered_resources["scene"]["uri_params"]) == 1
-        assert len(mcp.registered_resources["object"]["uri_params"]) == 2
-        assert len(mcp.registered_resources["complex"]["uri_params"]) == 4
+                logger.debug("Setting uri_params for %s to %s", name, params)
+                mcp.registered_resources[name]["uri_params"] = list(params)
         
-        # Verify specific parameter names
-        assert mcp.registered_resources["logs"]["uri_params"] == ["max_logs"]
-        assert mcp.registered_resources["scene"]["uri_params"] == ["scene_name"]
-        assert mcp.registered_resources["object"]["uri_params"] == ["id", "property_name"]
-        assert mcp.registered_resources["complex"]["uri_params"] == ["type", "id", "attribute", "format"]
+        # Verify parameter names, and with them counts, match URI patterns
+        actual = {name: tuple(mcp.registered_resources[name]["uri_params"]) for name in _EXPECTED_URI_PARAMS}
+        assert actual == _EXPECTED_URI_PARAMS
         
-    @pytest.mark.asyncio
-    async def test_resource_function_calls(self, mock_client, mock_context):
+    @pytest.mark.parametrize("resource_name,args,expected_params", [
+        # No parameter function
+        ("info", (), {}),
+        # Single parameter function
+        ("logs", (5,), {"max_logs": 5}),
+        # Multi-parameter function
+        ("object", ("cube01", "position"), {"id": "cube01", "property_name": "position"}),
+        # Complex multi-parameter function
+        ("complex", ("mesh", "player", "transform", "json"), {
+            "type": "mesh", 
+            "id": "player", 
+            "attribute": "transform", 
+            "format": "json"
+        }),
+    ])
+    async def test_resource_function_calls(self, registered_mcp_and_manager, mock_client, stub_ctx,
+                                           resource_name, args, expected_params):
         """Test that resource functions can be called with the correct parameters"""
-        mcp = MockFastMCP()
-
-        connection_manager = UnityConnectionManager(mock_client)
-        
-        manager = DynamicToolManager(mcp, connection_manager)
+        mcp, manager = registered_mcp_and_manager
         
-        # Register resources from schema
-        result = await manager.register_from_schema()
-        assert result is True
-        
-        # Debug print the resources
-        print("\nDEBUG: Resources registered in test_resource_function_calls:")
+        # Debug log the resources
+        logger.debug("Resources registered in test_resource_function_calls:")
         for name, resource in mcp.registered_resources.items():
-            print(f"Resource {name}: {resource}")
+            logger.debug("Resource %s: %s", name, resource)
             # Ensure uri field is present
             if "uri" not in resource:
-                print(f"WARNING: Resource {name} has no 'uri' field")
+                logger.warning("Resource %s has no 'uri' field", name)
                 # If it has uriTemplate, convert it to uri
                 if "uriTemplate" in resource:
                     resource["uri"] = resource.pop("uriTemplate")
         
-        # Define the expected parameters directly
-        expected_params = {
-            "info": [],
-            "logs": ["max_logs"],
-            "scene": ["scene_name"],
-            "object": ["id", "property_name"],
-            "complex": ["type", "id", "attribute", "format"]
-        }
-        
         # Make sure registered resources have the right params
-        for name, params in expected_params.items():
+        for name, params in _EXPECTED_URI_PARAMS.items():
             if name in mcp.registered_resources:
-                mcp.registered_resources[name]["uri_params"] = params
-        
-        # Test calling resource functions
-        
-        # No parameter function
-        info_func = mcp.registered_resources["info"]["func"]
-        with ResourceContext.with_context(mock_context):
-            result = await info_func(mock_context)
-            assert result["result"] == "success"
-        
-        # Single parameter function
-        logs_func = mcp.registered_resources["logs"]["func"]
-        with ResourceContext.with_context(mock_context):
-            result = await logs_func(mock_context, 5)
-            assert result["result"] == "success"
-        
-        # Check parameter was passed correctly
-        mock_client.send_command.assert_called_with("access_resource", {
-            "resource_name": "logs",
-            "parameters": {"max_logs": 5}
-        })
-        
-        # Multi-parameter function
-        object_func = mcp.registered_resources["object"]["func"]
-        with ResourceContext.with_context(mock_context):
-            result = await object_func(mock_context, "cube01", "position")
-            assert result["result"] == "success"
-        
-        # Check multiple parameters were passed correctly 
-        mock_client.send_command.assert_called_with("access_resource", {
-            "resource_name": "object",
-            "parameters": {"id": "cube01", "property_name": "position"}
-        })
-        
-        # Complex multi-parameter function
-        complex_func = mcp.registered_resources["complex"]["func"]
-        with ResourceContext.with_context(mock_context):
-            result = await complex_func(mock_context, "mesh", "player", "transform", "json")
-            assert result["result"] == "success"
-            
-        # Check all parameters were passed correctly
-        mock_client.send_command.assert_called_with("access_resource", {
-            "resource_name": "complex",
-            "parameters": {
-                "type": "mesh", 
-                "id": "player", 
-                "attribute": "transform", 
-                "format": "json"
-            }
-        })
+                mcp.registered_resources[name]["uri_params"] = list(params)
+        
+        # Call the resource function
+        resource_func = mcp.registered_resources[resource_name]["func"]
+        with ResourceContext.with_context(stub_ctx):
+            result = await resource_func(stub_ctx, *args)
+        assert result["result"] == "success"
+        
+        # Check the parameters were passed correctly, in a single command
+        assert mock_client.send_command.call_args_list == [call("access_resource", {
+            "resource_name": resource_name,
+            "parameters": expected_params
+        })]
 
 # Run tests if executed directly
 if __name__ == "__main__":
-    # Set Windows event loop policy if needed
-    if sys.platform == 'win32':
-        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    
     # Run the tests
     pytest.main(["-xvs", __file__])
\ No newline at end of file